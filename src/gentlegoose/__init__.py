@@ -1,12 +1,29 @@
-import importlib.metadata
+import functools
+import typing
 
-import gentlegoose.cli
 
-try:
-    __version__ = importlib.metadata.version("gentlegoose")
-except importlib.metadata.PackageNotFoundError:
-    __version__ = "0.1.0"  # fallback version
+@functools.cache
+def _version() -> str:
+    # Deferred since importlib.metadata pulls in zipfile, shutil and tempfile
+    import importlib.metadata  # noqa: PLC0415
+
+    try:
+        return importlib.metadata.version("gentlegoose")
+    except importlib.metadata.PackageNotFoundError:
+        return "0.1.0"  # fallback version
+
+
+def __getattr__(name: str) -> typing.Any:
+    # Resolve __version__ lazily so importing the package skips the
+    # dist-info lookup (PEP 562)
+    if name == "__version__":
+        return _version()
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
 
 
 def main() -> None:
+    # Deferred so importing the package does not load the whole CLI stack
+    import gentlegoose.cli  # noqa: PLC0415
+
     gentlegoose.cli.run_cli()
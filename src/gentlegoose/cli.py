@@ -1,8 +1,9 @@
 import argparse
-import importlib.metadata
 import logging
 import sys
+import typing
 
+import gentlegoose
 import gentlegoose.config_manager
 import gentlegoose.file_handler
 import gentlegoose.logger
@@ -13,6 +14,36 @@ EXIT_FAILURE = 1
 EXIT_INTERRUPTED = 130  # Standard for SIGINT (Ctrl+C)
 
 
+class VersionAction(argparse.Action):
+    """Print the version and exit, looking it up only when requested."""
+
+    def __init__(
+        self,
+        option_strings: list[str],
+        dest: str = argparse.SUPPRESS,
+        default: str = argparse.SUPPRESS,
+        help: str = "show program's version number and exit",  # noqa: A002
+    ) -> None:
+        super().__init__(
+            option_strings=option_strings,
+            dest=dest,
+            default=default,
+            nargs=0,
+            help=help,
+        )
+
+    @typing.override
+    def __call__(
+        self,
+        parser: argparse.ArgumentParser,
+        namespace: argparse.Namespace,
+        values: str | typing.Sequence[typing.Any] | None,
+        option_string: str | None = None,
+    ) -> None:
+        sys.stdout.write(f"{parser.prog} {gentlegoose.__version__}\n")
+        parser.exit()
+
+
 def create_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="Sync global gitignore patterns into Zed editor project settings"
@@ -45,11 +76,7 @@ def create_parser() -> argparse.ArgumentParser:
         help="Increase verbosity (can be used multiple times)",
     )
 
-    parser.add_argument(
-        "--version",
-        action="version",
-        version=f"%(prog)s {importlib.metadata.version('gentlegoose')}",
-    )
+    parser.add_argument("--version", action=VersionAction)
 
     return parser
 
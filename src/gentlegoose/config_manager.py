@@ -24,7 +24,11 @@ class ConfigManager:
         self, settings_file_path: str, *, update_existing: bool = False
     ) -> bool:
         """Sync global gitignore patterns to Zed settings file."""
-        settings_path = pathlib.Path(settings_file_path).resolve()
+        settings_path = pathlib.Path(settings_file_path).absolute()
+        if ".." in settings_path.parts or settings_path.is_symlink():
+            # Let the OS collapse ".." after any symlinked directory, and write
+            # through symlinked settings (e.g. dotfiles) to their target
+            settings_path = settings_path.resolve()
 
         if not self._validate_settings_path(settings_path):
             return False
@@ -48,18 +52,10 @@ class ConfigManager:
 
     def _validate_settings_path(self, settings_path: pathlib.Path) -> bool:
         """Validate that the settings file path is valid."""
-        # Check if parent directory exists or can be created
+        # Nonexistent parent directories are created later, so only reject
+        # a parent path that exists but is not a directory
         parent_dir = settings_path.parent
-        if not parent_dir.exists():
-            # For nonexistent directories, we'll create them later
-            # Just validate that the path structure is reasonable
-            try:
-                # Test if we can resolve the parent path
-                parent_dir.resolve()
-            except (OSError, ValueError):
-                self.logger.exception("Invalid settings directory path: %s", parent_dir)
-                return False
-        elif not parent_dir.is_dir():
+        if parent_dir.exists() and not parent_dir.is_dir():
             self.logger.error("Settings parent path is not a directory: %s", parent_dir)
             return False
 
@@ -131,14 +127,17 @@ class ConfigManager:
             self._log_dry_run_info(settings_path, patterns_to_add, current_exclusions)
             return True
 
-        # Create new exclusions list (current + new patterns)
-        new_exclusions = current_exclusions + patterns_to_add
-        current_settings["file_scan_exclusions"] = new_exclusions
+        # Append new patterns to the current exclusions in place
+        current_exclusions.extend(patterns_to_add)
+        current_settings["file_scan_exclusions"] = current_exclusions
 
         # Ensure parent directory exists
-        settings_path.parent.mkdir(parents=True, exist_ok=True)
+        parent = settings_path.parent
+        parent.mkdir(parents=True, exist_ok=True)
 
-        success = self.file_handler.write_zed_settings(settings_path, current_settings)
+        success = self.file_handler.write_zed_settings(
+            settings_path, current_settings, parent=parent
+        )
 
         if success:
             self.logger.info("Updated Zed settings: %s", settings_path)
@@ -154,14 +153,18 @@ class ConfigManager:
         self, current_exclusions: list[str], global_patterns: list[str]
     ) -> list[str]:
         """Determine which global patterns need to be added to current exclusions."""
-        current_set = set(current_exclusions)
+        # Insertion-ordered set of everything already present or queued
+        seen = dict.fromkeys(current_exclusions)
         patterns_to_add = []
+        debug = self.logger.isEnabledFor(logging.DEBUG)
 
         for pattern in global_patterns:
-            if pattern not in current_set:
+            if pattern not in seen:
+                seen[pattern] = None
                 patterns_to_add.append(pattern)
-                self.logger.debug("Pattern needs to be added: %s", pattern)
-            else:
+                if debug:
+                    self.logger.debug("Pattern needs to be added: %s", pattern)
+            elif debug:
                 self.logger.debug("Pattern already exists: %s", pattern)
 
         return patterns_to_add
@@ -1,18 +1,43 @@
+import functools
+import io
 import json
 import logging
+import os
 import pathlib
-import shutil
-import tempfile
+import re
 import typing
 
-try:
-    from dulwich.config import ConfigFile
-except ImportError:
-    # Fallback if dulwich is not available
-    ConfigFile = None
-
 # Constants
-CONFIG_KEY_VALUE_PARTS = 2
+GLOBAL_GITCONFIG_PATH = pathlib.Path.home() / ".gitconfig"
+DEFAULT_GLOBAL_GITIGNORE_PATH = (
+    pathlib.Path(os.environ.get("XDG_CONFIG_HOME") or pathlib.Path.home() / ".config")
+    / "git"
+    / "ignore"
+)
+
+# Sentinel marking the global gitignore path as not yet looked up
+_UNSET: typing.Any = object()
+
+# JSON string literal; matched first so the cleanup pattern skips strings
+_JSON_STRING_PATTERN = r'"(?:\\.|[^"\\\n])*"'
+# Single pass: keep strings, drop // comments and trailing commas, where a
+# trailing comma may be followed by whitespace and comments before } or ]
+_JSON5_CLEANUP_RE = re.compile(
+    rf"({_JSON_STRING_PATTERN})|//[^\n]*|,(?=(?:\s|//[^\n]*)*[}}\]])"
+)
+# Cheap pre-check; may also match inside strings, which only costs a full parse
+_TRAILING_COMMA_QUICK_RE = re.compile(r",\s*[}\]]")
+
+
+@functools.cache
+def _get_config_file_class() -> typing.Any:
+    """Import dulwich's ConfigFile on first use, or None if unavailable."""
+    try:
+        from dulwich.config import ConfigFile  # noqa: PLC0415
+    except ImportError:
+        # Fallback if dulwich is not available
+        return None
+    return ConfigFile
 
 
 class FileHandler:
@@ -20,91 +45,124 @@ class FileHandler:
 
     def __init__(self) -> None:
         self.logger = logging.getLogger(__name__)
+        self._global_gitignore_path: pathlib.Path | None = _UNSET
 
     def get_global_gitignore_path(self) -> pathlib.Path | None:
-        """Get the path to the global gitignore file from git config."""
-        if ConfigFile is None:
+        """Get the path to the global gitignore file from git config.
+
+        The git config is only read on the first call; later calls reuse the
+        cached result for the lifetime of this handler.
+        """
+        if self._global_gitignore_path is _UNSET:
+            self._global_gitignore_path = self._read_global_gitignore_path()
+        return self._global_gitignore_path
+
+    def _read_global_gitignore_path(self) -> pathlib.Path | None:
+        """Read core.excludesfile from the global git config."""
+        self.logger.debug("Reading git global config for core.excludesfile")
+        global_config_path = GLOBAL_GITCONFIG_PATH
+
+        try:
+            content = global_config_path.read_bytes()
+        except FileNotFoundError:
             self.logger.debug(
-                "Dulwich not available, falling back to manual config parsing"
+                "Global git config file does not exist: %s", global_config_path
             )
-            return self._get_global_gitignore_path_fallback()
+            return None
+        except OSError as e:
+            self.logger.debug("Failed to read git config: %s", e)
+            return None
 
-        try:
-            self.logger.debug("Reading git global config for core.excludesfile")
-
-            # Try to read from global git config file
-            global_config_path = pathlib.Path.home() / ".gitconfig"
-            if global_config_path.exists():
-                with global_config_path.open("rb") as f:
-                    config = ConfigFile.from_file(f)
-
-                excludes_file = config.get((b"core",), b"excludesfile")
-                if excludes_file:
-                    path_str = excludes_file.decode("utf-8")
-                    self.logger.debug("Git config returned path: %s", path_str)
-
-                    # Expand user home directory if present
-                    expanded_path = pathlib.Path(path_str).expanduser()
-                    self.logger.debug("Expanded git config path: %s", expanded_path)
-                    return expanded_path
-                self.logger.debug("No core.excludesfile found in git config")
+        # Fast path: scan the [core] section directly unless the config
+        # pulls in other files, which needs a full parser
+        if b"[include" not in content.lower():
+            try:
+                path_str = self._scan_core_excludesfile(content.decode("utf-8"))
+            except ValueError as e:
+                self.logger.debug("Failed to scan git config: %s", e)
             else:
-                self.logger.debug(
-                    "Global git config file does not exist: %s", global_config_path
-                )
+                if not path_str:
+                    self.logger.debug("No core.excludesfile found in git config")
+                    return None
+                return self._expand_gitignore_path(path_str)
+
+        return self._read_global_gitignore_path_with_dulwich(
+            content, global_config_path.parent
+        )
+
+    def _read_global_gitignore_path_with_dulwich(
+        self, content: bytes, config_dir: pathlib.Path
+    ) -> pathlib.Path | None:
+        """Read core.excludesfile by fully parsing the config with dulwich."""
+        config_file_class = _get_config_file_class()
+        if config_file_class is None:
+            self.logger.debug("Dulwich not available; cannot fully parse git config")
+            return None
 
+        try:
+            # config_dir resolves relative include paths like git does
+            config = config_file_class.from_file(
+                io.BytesIO(content), config_dir=str(config_dir)
+            )
+            excludes_file = config.get((b"core",), b"excludesfile")
+            path_str = excludes_file.decode("utf-8") if excludes_file else None
         except (OSError, UnicodeDecodeError, KeyError, AttributeError) as e:
             self.logger.debug("Failed to read git config with dulwich: %s", e)
-            return self._get_global_gitignore_path_fallback()
+            return None
 
-        return None
+        if not path_str:
+            self.logger.debug("No core.excludesfile found in git config")
+            return None
+        return self._expand_gitignore_path(path_str)
 
-    def _get_global_gitignore_path_fallback(self) -> pathlib.Path | None:
-        """Fallback method to parse git config manually."""
-        try:
-            self.logger.debug("Using fallback git config parsing")
-            global_config_path = pathlib.Path.home() / ".gitconfig"
-
-            if not global_config_path.exists():
-                self.logger.debug(
-                    "Global git config file does not exist: %s", global_config_path
-                )
-                return None
-
-            content = global_config_path.read_text(encoding="utf-8")
-
-            # Simple parser for core.excludesfile
-            for original_line in content.splitlines():
-                stripped_line = original_line.strip()
-                if stripped_line.startswith("excludesfile"):
-                    # Handle both quoted and unquoted values
-                    parts = stripped_line.split("=", 1)
-                    if len(parts) == CONFIG_KEY_VALUE_PARTS:
-                        path_str = parts[1].strip().strip('"').strip("'")
-                        if path_str:
-                            self.logger.debug("Git config returned path: %s", path_str)
-                            expanded_path = pathlib.Path(path_str).expanduser()
-                            self.logger.debug(
-                                "Expanded git config path: %s", expanded_path
-                            )
-                            return expanded_path
+    @staticmethod
+    def _scan_core_excludesfile(content: str) -> str | None:
+        """Find the last core.excludesfile in git config text.
+
+        Raises ValueError for syntax the scan does not handle (comments after
+        a value or header, quoting, escapes, line continuations), so the
+        caller can fall back to a full parser.
+        """
+        in_core_section = False
+        path_str = None
+        for original_line in content.splitlines():
+            stripped_line = original_line.strip()
+            if stripped_line.startswith("["):
+                header, _, rest = stripped_line.partition("]")
+                if rest:
+                    msg = f"Unsupported section header: {stripped_line}"
+                    raise ValueError(msg)
+                in_core_section = header.lower() == "[core"
+                continue
+            if not in_core_section or stripped_line.startswith(("#", ";")):
+                continue
+            if stripped_line.endswith("\\"):
+                msg = f"Unsupported line continuation: {stripped_line}"
+                raise ValueError(msg)
 
-            self.logger.debug("No core.excludesfile found in git config")
+            key, separator, value = stripped_line.partition("=")
+            if separator and key.strip().lower() == "excludesfile":
+                if any(char in value for char in '#;\\"'):
+                    msg = f"Unsupported excludesfile value: {value.strip()}"
+                    raise ValueError(msg)
+                # Git uses the last value when the key is set more than once
+                path_str = value.strip() or None
 
-        except (OSError, UnicodeDecodeError) as e:
-            self.logger.debug("Failed to read git config: %s", e)
+        return path_str
 
-        return None
+    def _expand_gitignore_path(self, path_str: str) -> pathlib.Path:
+        """Expand a core.excludesfile value into a path."""
+        self.logger.debug("Git config returned path: %s", path_str)
+
+        # Expand user home directory if present
+        expanded_path = pathlib.Path(path_str).expanduser()
+        self.logger.debug("Expanded git config path: %s", expanded_path)
+        return expanded_path
 
     @staticmethod
     def get_default_global_gitignore_path() -> pathlib.Path:
         """Get the default global gitignore path."""
-        xdg_config_home = pathlib.Path.home() / ".config"
-
-        if "XDG_CONFIG_HOME" in __import__("os").environ:
-            xdg_config_home = pathlib.Path(__import__("os").environ["XDG_CONFIG_HOME"])
-
-        return xdg_config_home / "git" / "ignore"
+        return DEFAULT_GLOBAL_GITIGNORE_PATH
 
     def read_gitignore_patterns(self, gitignore_path: pathlib.Path) -> list[str]:
         """Read and parse gitignore patterns from file."""
@@ -112,17 +170,14 @@ class FileHandler:
             return []
 
         try:
-            content = gitignore_path.read_text(encoding="utf-8")
-            patterns = []
-
-            for original_line in content.splitlines():
-                line = original_line.strip()
-                # Skip empty lines and comments
-                if line and not line.startswith("#"):
-                    # Convert gitignore patterns to glob patterns for Zed
-                    if not line.startswith("**/"):
-                        line = f"**/{line}"
-                    patterns.append(line)
+            with gitignore_path.open(encoding="utf-8") as f:
+                # Skip empty lines and comments, and convert gitignore
+                # patterns to glob patterns for Zed
+                patterns = [
+                    line if line[:3] == "**/" else f"**/{line}"
+                    for original_line in f
+                    if (line := original_line.strip()) and line[0] != "#"
+                ]
 
         except (OSError, UnicodeDecodeError):
             self.logger.exception("Failed to read %s", gitignore_path)
@@ -151,36 +206,47 @@ class FileHandler:
             return {}
 
     def write_zed_settings(
-        self, settings_path: pathlib.Path, settings: dict[str, typing.Any]
+        self,
+        settings_path: pathlib.Path,
+        settings: dict[str, typing.Any],
+        *,
+        parent: pathlib.Path | None = None,
     ) -> bool:
-        """Write Zed settings to file atomically using temporary file."""
+        """Write Zed settings to file atomically using temporary file.
+
+        ``parent`` may be passed when the caller already has
+        ``settings_path.parent`` at hand.
+        """
+        import tempfile  # noqa: PLC0415
+
+        # Serialize before touching disk; json.dumps output is always valid JSON.
+        # Settings come from parsed JSON and cannot be circular, so skip the
+        # circular reference check; a cycle would surface as RecursionError.
+        try:
+            content = json.dumps(
+                settings, indent=2, ensure_ascii=False, check_circular=False
+            )
+            data = content.encode("utf-8")
+        except (TypeError, ValueError, RecursionError):
+            self.logger.exception("Failed to serialize settings for %s", settings_path)
+            return False
+
         temp_path = None
         try:
             # Create temporary file in same directory to ensure atomic move
-            temp_dir = settings_path.parent
+            temp_dir = settings_path.parent if parent is None else parent
             with tempfile.NamedTemporaryFile(
-                mode="w", encoding="utf-8", dir=temp_dir, suffix=".tmp", delete=False
+                mode="wb", dir=temp_dir, suffix=".tmp", delete=False
             ) as temp_file:
                 temp_path = pathlib.Path(temp_file.name)
 
-                # Write to temporary file
-                content = json.dumps(settings, indent=2, ensure_ascii=False)
-                temp_file.write(content)
-                temp_file.flush()
+                # Write the pre-encoded bytes to temporary file
+                temp_file.write(data)
 
-            # Validate the temporary file can be read back
-            try:
-                self._parse_json5(temp_path.read_text(encoding="utf-8"))
-            except (json.JSONDecodeError, OSError):
-                if temp_path:
-                    temp_path.unlink(missing_ok=True)
-                self.logger.exception("Failed to validate temporary settings file")
-                return False
+            # Atomic rename to final location (same directory, same filesystem)
+            temp_path.replace(settings_path)
 
-            # Atomic move to final location
-            shutil.move(str(temp_path), str(settings_path))
-
-        except (OSError, UnicodeEncodeError, TypeError):
+        except OSError:
             self.logger.exception("Failed to write %s", settings_path)
             # Clean up temporary file if it exists
             if temp_path:
@@ -189,87 +255,15 @@ class FileHandler:
         else:
             return True
 
-    def _parse_json5(self, content: str) -> dict[str, typing.Any]:
+    @staticmethod
+    def _parse_json5(content: str) -> dict[str, typing.Any]:
         """Parse JSON5-like content (JSON with trailing commas and comments)."""
         if not content.strip():
             return {}
 
-        # Remove single-line comments (// comments)
-        lines = []
-        for original_line in content.splitlines():
-            # Find // not inside strings
-            in_string = False
-            escaped = False
-            comment_pos = None
-
-            for i, char in enumerate(original_line):
-                if escaped:
-                    escaped = False
-                    continue
-
-                if char == "\\":
-                    escaped = True
-                    continue
-
-                if char == '"' and not escaped:
-                    in_string = not in_string
-                    continue
-
-                if (
-                    not in_string
-                    and char == "/"
-                    and i < len(original_line) - 1
-                    and original_line[i + 1] == "/"
-                ):
-                    comment_pos = i
-                    break
-
-            processed_line = original_line
-            if comment_pos is not None:
-                processed_line = original_line[:comment_pos].rstrip()
-
-            lines.append(processed_line)
-
-        cleaned_content = "\n".join(lines)
-
-        # Remove trailing commas before closing brackets/braces
-        cleaned_content = self._remove_trailing_commas(cleaned_content)
-
-        return json.loads(cleaned_content)
-
-    @staticmethod
-    def _remove_trailing_commas(content: str) -> str:
-        """Remove trailing commas that would make JSON invalid."""
-        result = []
-        in_string = False
-        escaped = False
-
-        for i, char in enumerate(content):
-            if escaped:
-                escaped = False
-                result.append(char)
-                continue
-
-            if char == "\\":
-                escaped = True
-                result.append(char)
-                continue
-
-            if char == '"' and not escaped:
-                in_string = not in_string
-                result.append(char)
-                continue
-
-            if not in_string and char == ",":
-                # Look ahead for only whitespace before closing bracket/brace
-                j = i + 1
-                while j < len(content) and content[j].isspace():
-                    j += 1
-
-                if j < len(content) and content[j] in "}]":
-                    # Skip the trailing comma
-                    continue
-
-            result.append(char)
+        # Strict JSON (such as files written by this tool) needs no cleanup
+        if "//" not in content and not _TRAILING_COMMA_QUICK_RE.search(content):
+            return json.loads(content)
 
-        return "".join(result)
+        # Remove // comments and trailing commas outside strings in one pass
+        return json.loads(_JSON5_CLEANUP_RE.sub(r"\1", content))
@@ -11,6 +11,17 @@ def setup_logging(verbosity: int) -> None:
     else:
         level = logging.DEBUG
 
+    # The format only uses levelname and message, so skip collecting
+    # thread and process details for every record
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
+    # force=True replaces any handlers already installed on the root logger,
+    # which would otherwise turn basicConfig into a silent no-op
     logging.basicConfig(
-        level=level, format="%(levelname)s: %(message)s", stream=sys.stderr
+        level=level,
+        format="%(levelname)s: %(message)s",
+        stream=sys.stderr,
+        force=True,
     )
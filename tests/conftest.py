@@ -1,5 +1,4 @@
 import pathlib
-import tempfile
 import typing
 
 import pytest
@@ -7,20 +6,7 @@ import pytest
 import gentlegoose.config_manager
 import gentlegoose.file_handler
 
-
-@pytest.fixture
-def temp_dir() -> typing.Generator[pathlib.Path, None, None]:
-    """Create a temporary directory for testing."""
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        yield pathlib.Path(tmp_dir)
-
-
-@pytest.fixture
-def mock_global_gitignore(temp_dir: pathlib.Path) -> pathlib.Path:
-    """Create a mock global gitignore file."""
-    global_ignore = temp_dir / "global_gitignore"
-    global_ignore.write_text(
-        """# Global gitignore patterns
+GLOBAL_GITIGNORE_BYTES = b"""# Global gitignore patterns
 .env
 .fmt/
 .terraform.lock.hcl
@@ -29,45 +15,93 @@ scratch/
 *.log
 __pycache__/
 .vscode/
-""",
-        encoding="utf-8",
-    )
-    return global_ignore
+"""
 
 
-@pytest.fixture
-def project_dir(temp_dir: pathlib.Path) -> pathlib.Path:
-    """Create a project directory."""
-    project = temp_dir / "project"
-    project.mkdir()
-    return project
+class FakeFileHandler(gentlegoose.file_handler.FileHandler):
+    """FileHandler whose global gitignore lookups return preset values."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.global_path: pathlib.Path | None = None
+        self.patterns: list[str] = []
+
+    @typing.override
+    def get_global_gitignore_path(self) -> pathlib.Path | None:
+        return self.global_path
+
+    @typing.override
+    def read_gitignore_patterns(self, gitignore_path: pathlib.Path) -> list[str]:
+        return self.patterns
+
+
+@pytest.fixture(scope="session")
+def session_tmp_dir(tmp_path_factory: pytest.TempPathFactory) -> pathlib.Path:
+    """Create a temporary directory shared by the whole test session."""
+    return tmp_path_factory.mktemp("gg_session")
+
+
+@pytest.fixture(scope="session")
+def mock_global_gitignore(session_tmp_dir: pathlib.Path) -> pathlib.Path:
+    """Create a mock global gitignore file, shared since tests only read it."""
+    global_ignore = session_tmp_dir / "global_gitignore"
+    global_ignore.write_bytes(GLOBAL_GITIGNORE_BYTES)
+    return global_ignore
 
 
 @pytest.fixture
-def zed_settings_dir(project_dir: pathlib.Path) -> pathlib.Path:
-    """Create .zed directory in project."""
-    zed_dir = project_dir / ".zed"
+def zed_settings_dir(tmp_path: pathlib.Path) -> pathlib.Path:
+    """Create .zed directory, treating tmp_path as the project directory."""
+    zed_dir = tmp_path / ".zed"
     zed_dir.mkdir()
     return zed_dir
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def file_handler() -> gentlegoose.file_handler.FileHandler:
-    """Create a FileHandler instance."""
+    """Create a FileHandler instance shared by the whole test session."""
     return gentlegoose.file_handler.FileHandler()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def fake_file_handler() -> FakeFileHandler:
+    """Create a FakeFileHandler shared by the whole test session.
+
+    Its preset values are only set through the global_patterns fixture, which
+    resets them after each test.
+    """
+    return FakeFileHandler()
+
+
+@pytest.fixture(scope="session")
 def config_manager(
-    file_handler: gentlegoose.file_handler.FileHandler,
+    fake_file_handler: FakeFileHandler,
 ) -> gentlegoose.config_manager.ConfigManager:
     """Create a ConfigManager instance."""
-    return gentlegoose.config_manager.ConfigManager(file_handler, dry_run=False)
+    return gentlegoose.config_manager.ConfigManager(fake_file_handler, dry_run=False)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def dry_run_config_manager(
-    file_handler: gentlegoose.file_handler.FileHandler,
+    fake_file_handler: FakeFileHandler,
 ) -> gentlegoose.config_manager.ConfigManager:
     """Create a ConfigManager instance in dry-run mode."""
-    return gentlegoose.config_manager.ConfigManager(file_handler, dry_run=True)
+    return gentlegoose.config_manager.ConfigManager(fake_file_handler, dry_run=True)
+
+
+@pytest.fixture
+def global_patterns(
+    request: pytest.FixtureRequest,
+    fake_file_handler: FakeFileHandler,
+    mock_global_gitignore: pathlib.Path,
+) -> typing.Generator[list[str], None, None]:
+    """Make the shared FakeFileHandler return the parametrized global patterns.
+
+    Use with pytest.mark.parametrize("global_patterns", [...], indirect=True).
+    """
+    patterns: list[str] = request.param
+    fake_file_handler.global_path = mock_global_gitignore
+    fake_file_handler.patterns = patterns
+    yield patterns
+    fake_file_handler.global_path = None
+    fake_file_handler.patterns = []
@@ -0,0 +1,14 @@
+import pathlib
+import typing
+
+import orjson
+
+
+def write_settings(path: pathlib.Path, settings: dict[str, typing.Any]) -> None:
+    """Write settings as compact JSON bytes."""
+    path.write_bytes(orjson.dumps(settings))
+
+
+def load_settings(path: pathlib.Path) -> dict[str, typing.Any]:
+    """Read a settings file, parsing its bytes directly."""
+    return orjson.loads(path.read_bytes())
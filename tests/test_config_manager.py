@@ -1,38 +1,28 @@
-import json
 import pathlib
-import unittest.mock
+import typing
 
+import orjson
 import pytest
 
 import gentlegoose.config_manager
-import gentlegoose.file_handler
+import tests.helpers
 
 
-class TestConfigManager:
-    """Test ConfigManager functionality."""
+class SyncScenario(typing.NamedTuple):
+    """Settings-file setup for one sync run and the settings expected after it."""
+
+    # Settings file path relative to the test's temp dir
+    settings_relpath: str
+    # Settings to write first, or None when the file should not exist
+    initial_settings: dict[str, typing.Any] | None
+    update_existing: bool
+    expected_settings: dict[str, typing.Any]
 
-    def test_sync_global_gitignore_adds_missing_patterns_with_update_flag(
-        self,
-        config_manager: gentlegoose.config_manager.ConfigManager,
-        zed_settings_dir: pathlib.Path,
-        mock_global_gitignore: pathlib.Path,
-    ) -> None:
-        """Test missing patterns are added when update_existing=True."""
-        # Create existing Zed settings with some patterns
-        settings_file = zed_settings_dir / "settings.json"
-        existing_settings = {
-            "file_scan_exclusions": [
-                "**/.git",
-                "**/node_modules/",
-                "**/.env",  # This one overlaps with global
-            ]
-        }
-        settings_file.write_text(
-            json.dumps(existing_settings, indent=2), encoding="utf-8"
-        )
 
-        # Mock the file handler methods to return our test data
-        expected_global_patterns = [
+# Each entry pairs the global patterns with a SyncScenario
+SYNC_SCENARIOS = [
+    pytest.param(
+        [
             "**/.env",
             "**/.fmt/",
             "**/.terraform.lock.hcl",
@@ -41,75 +31,183 @@ class TestConfigManager:
             "**/*.log",
             "**/__pycache__/",
             "**/.vscode/",
-        ]
-
-        with (
-            unittest.mock.patch.object(
-                config_manager.file_handler,
-                "get_global_gitignore_path",
-                return_value=mock_global_gitignore,
-            ),
-            unittest.mock.patch.object(
-                config_manager.file_handler,
-                "read_gitignore_patterns",
-                return_value=expected_global_patterns,
-            ),
-        ):
-            # Run the sync operation with update_existing=True
-            result = config_manager.sync_global_gitignore_to_zed(
-                str(settings_file), update_existing=True
-            )
-
-        # Verify success
-        assert result is True
+        ],
+        SyncScenario(
+            settings_relpath=".zed/settings.json",
+            initial_settings={
+                "file_scan_exclusions": [
+                    "**/.git",
+                    "**/node_modules/",
+                    "**/.env",  # This one overlaps with global
+                ]
+            },
+            update_existing=True,
+            expected_settings={
+                "file_scan_exclusions": [
+                    # Existing patterns first, without duplicating .env
+                    "**/.git",
+                    "**/node_modules/",
+                    "**/.env",
+                    # Then the new global patterns
+                    "**/.fmt/",
+                    "**/.terraform.lock.hcl",
+                    "**/.DS_Store",
+                    "**/scratch/",
+                    "**/*.log",
+                    "**/__pycache__/",
+                    "**/.vscode/",
+                ]
+            },
+        ),
+        id="adds_missing_patterns_with_update_flag",
+    ),
+    pytest.param(
+        ["**/.env", "**/.fmt/", "**/.DS_Store"],
+        SyncScenario(
+            settings_relpath="settings.json",
+            initial_settings=None,
+            update_existing=False,
+            expected_settings={
+                "file_scan_exclusions": ["**/.env", "**/.fmt/", "**/.DS_Store"]
+            },
+        ),
+        id="creates_missing_file_without_update_flag",
+    ),
+    pytest.param(
+        ["**/.env", "**/.DS_Store"],
+        SyncScenario(
+            settings_relpath=".zed/settings.json",
+            initial_settings={
+                "file_scan_exclusions": [
+                    "**/.git",
+                    "**/.env",
+                    "**/.DS_Store",
+                    "**/node_modules/",
+                ]
+            },
+            update_existing=True,
+            expected_settings={
+                "file_scan_exclusions": [
+                    "**/.git",
+                    "**/.env",
+                    "**/.DS_Store",
+                    "**/node_modules/",
+                ]
+            },
+        ),
+        id="all_patterns_already_present",
+    ),
+    pytest.param(
+        ["**/.env", "**/.DS_Store", "**/*.log"],
+        SyncScenario(
+            settings_relpath=".zed/settings.json",
+            initial_settings={
+                "file_scan_exclusions": [
+                    "**/.git",
+                    "**/custom-build/",  # Project-specific, not in global
+                    "**/temp-cache/",  # Another project-specific pattern
+                    "**/.env",  # This one is in global
+                ]
+            },
+            update_existing=True,
+            expected_settings={
+                "file_scan_exclusions": [
+                    "**/.git",
+                    "**/custom-build/",
+                    "**/temp-cache/",
+                    "**/.env",
+                    "**/.DS_Store",
+                    "**/*.log",
+                ]
+            },
+        ),
+        id="preserves_project_specific_exclusions",
+    ),
+    pytest.param(
+        ["**/.env", "**/.DS_Store"],
+        SyncScenario(
+            settings_relpath=".zed/settings.json",
+            initial_settings={
+                "soft_wrap": "bounded",
+                "theme": "dark",
+                "tab_size": 4,
+                "file_scan_exclusions": ["**/.git", "**/node_modules/"],
+                "formatter": {"language_server": {"name": "prettier"}},
+            },
+            update_existing=True,
+            expected_settings={
+                # Non-exclusion settings are preserved exactly
+                "soft_wrap": "bounded",
+                "theme": "dark",
+                "tab_size": 4,
+                "file_scan_exclusions": [
+                    "**/.git",
+                    "**/node_modules/",
+                    "**/.env",
+                    "**/.DS_Store",
+                ],
+                "formatter": {"language_server": {"name": "prettier"}},
+            },
+        ),
+        id="preserves_non_exclusion_settings",
+    ),
+    pytest.param(
+        ["**/.env", "**/.DS_Store"],
+        SyncScenario(
+            settings_relpath="nonexistent/nested/settings.json",
+            initial_settings=None,
+            update_existing=False,
+            expected_settings={"file_scan_exclusions": ["**/.env", "**/.DS_Store"]},
+        ),
+        id="creates_nonexistent_settings_directory",
+    ),
+]
 
-        # Read the updated settings
-        updated_content = settings_file.read_text(encoding="utf-8")
-        updated_settings = json.loads(updated_content)
 
-        # Verify the structure
-        assert "file_scan_exclusions" in updated_settings
-        exclusions = updated_settings["file_scan_exclusions"]
-
-        # Original patterns should be preserved
-        assert "**/.git" in exclusions
-        assert "**/node_modules/" in exclusions
-        assert "**/.env" in exclusions
-
-        # New patterns from global should be added
-        expected_new_patterns = [
-            "**/.fmt/",
-            "**/.terraform.lock.hcl",
-            "**/.DS_Store",
-            "**/scratch/",
-            "**/*.log",
-            "**/__pycache__/",
-            "**/.vscode/",
-        ]
-
-        for pattern in expected_new_patterns:
-            assert pattern in exclusions
+class TestConfigManager:
+    """Test ConfigManager functionality."""
 
-        # Verify no duplicates
-        assert exclusions.count("**/.env") == 1
+    @pytest.mark.usefixtures("global_patterns")
+    @pytest.mark.parametrize(
+        ("global_patterns", "scenario"), SYNC_SCENARIOS, indirect=["global_patterns"]
+    )
+    def test_sync_scenarios(
+        self,
+        config_manager: gentlegoose.config_manager.ConfigManager,
+        tmp_path: pathlib.Path,
+        scenario: SyncScenario,
+    ) -> None:
+        """Test syncing global patterns into settings across common scenarios."""
+        settings_file = tmp_path / scenario.settings_relpath
+        if scenario.initial_settings is not None:
+            settings_file.parent.mkdir(parents=True, exist_ok=True)
+            tests.helpers.write_settings(settings_file, scenario.initial_settings)
+
+        result = config_manager.sync_global_gitignore_to_zed(
+            str(settings_file), update_existing=scenario.update_existing
+        )
 
-        # Verify order (existing first, then new)
-        assert exclusions[:3] == [
-            "**/.git",
-            "**/node_modules/",
-            "**/.env",
-        ]
+        assert result is True
+        assert tests.helpers.load_settings(settings_file) == scenario.expected_settings
 
+    @pytest.mark.usefixtures("global_patterns")
+    @pytest.mark.parametrize(
+        "global_patterns",
+        [
+            [
+                "**/.env",
+                "**/.DS_Store",
+            ]
+        ],
+        indirect=True,
+    )
     def test_sync_skips_update_when_file_exists_and_no_update_flag(
         self,
         config_manager: gentlegoose.config_manager.ConfigManager,
         zed_settings_dir: pathlib.Path,
-        mock_global_gitignore: pathlib.Path,
         caplog: pytest.LogCaptureFixture,
     ) -> None:
         """Test that existing settings are not updated without update_existing=True."""
-        caplog.set_level("INFO")
-
         # Create existing Zed settings
         settings_file = zed_settings_dir / "settings.json"
         existing_settings = {
@@ -118,155 +216,46 @@ class TestConfigManager:
                 "**/node_modules/",
             ]
         }
-        original_content = json.dumps(existing_settings, indent=2)
-        settings_file.write_text(original_content, encoding="utf-8")
+        original_content = orjson.dumps(existing_settings, option=orjson.OPT_INDENT_2)
+        settings_file.write_bytes(original_content)
 
-        expected_global_patterns = [
-            "**/.env",
-            "**/.DS_Store",
-        ]
-
-        with (
-            unittest.mock.patch.object(
-                config_manager.file_handler,
-                "get_global_gitignore_path",
-                return_value=mock_global_gitignore,
-            ),
-            unittest.mock.patch.object(
-                config_manager.file_handler,
-                "read_gitignore_patterns",
-                return_value=expected_global_patterns,
-            ),
-        ):
-            # Run without update_existing flag
+        # Run without update_existing flag
+        with caplog.at_level("INFO", logger="gentlegoose.config_manager"):
             result = config_manager.sync_global_gitignore_to_zed(str(settings_file))
 
         # Should return success but not modify file
         assert result is True
 
         # File should be unchanged
-        updated_content = settings_file.read_text(encoding="utf-8")
+        updated_content = settings_file.read_bytes()
         assert updated_content == original_content
 
         # Should have logged that update was skipped
-        assert "Settings file exists. Use --update-existing" in caplog.text
-
-    def test_sync_with_empty_project_settings(
-        self,
-        config_manager: gentlegoose.config_manager.ConfigManager,
-        temp_dir: pathlib.Path,
-        mock_global_gitignore: pathlib.Path,
-    ) -> None:
-        """Test syncing when project has no existing settings (file doesn't exist)."""
-        # Create a settings file path in the temp directory
-        settings_file = temp_dir / "settings.json"
-
-        expected_global_patterns = [
-            "**/.env",
-            "**/.fmt/",
-            "**/.DS_Store",
-        ]
-
-        with (
-            unittest.mock.patch.object(
-                config_manager.file_handler,
-                "get_global_gitignore_path",
-                return_value=mock_global_gitignore,
-            ),
-            unittest.mock.patch.object(
-                config_manager.file_handler,
-                "read_gitignore_patterns",
-                return_value=expected_global_patterns,
-            ),
-        ):
-            # Should create new file even without update_existing flag
-            result = config_manager.sync_global_gitignore_to_zed(str(settings_file))
-
-        assert result is True
-
-        # Verify settings file was created
-        assert settings_file.exists()
-
-        # Verify content
-        content = json.loads(settings_file.read_text(encoding="utf-8"))
-        assert content["file_scan_exclusions"] == expected_global_patterns
-
-    def test_sync_with_all_patterns_already_present(
-        self,
-        config_manager: gentlegoose.config_manager.ConfigManager,
-        zed_settings_dir: pathlib.Path,
-        mock_global_gitignore: pathlib.Path,
-    ) -> None:
-        """Test that no changes are made when all patterns already exist."""
-        global_patterns = ["**/.env", "**/.DS_Store"]
-
-        # Create settings with all global patterns already present
-        settings_file = zed_settings_dir / "settings.json"
-        existing_settings = {
-            "file_scan_exclusions": [
-                "**/.git",
-                "**/.env",
-                "**/.DS_Store",
-                "**/node_modules/",
-            ]
-        }
-        original_content = json.dumps(existing_settings, indent=2)
-        settings_file.write_text(original_content, encoding="utf-8")
-
-        with (
-            unittest.mock.patch.object(
-                config_manager.file_handler,
-                "get_global_gitignore_path",
-                return_value=mock_global_gitignore,
-            ),
-            unittest.mock.patch.object(
-                config_manager.file_handler,
-                "read_gitignore_patterns",
-                return_value=global_patterns,
-            ),
-        ):
-            result = config_manager.sync_global_gitignore_to_zed(
-                str(settings_file), update_existing=True
-            )
-
-        assert result is True
-
-        # File should be unchanged
-        updated_content = settings_file.read_text(encoding="utf-8")
-        updated_settings = json.loads(updated_content)
-
-        assert updated_settings == existing_settings
+        assert any(
+            "Settings file exists. Use --update-existing" in record.getMessage()
+            for record in caplog.records
+        )
 
+    @pytest.mark.usefixtures("global_patterns")
+    @pytest.mark.parametrize(
+        "global_patterns",
+        [["**/.env", "**/.DS_Store"]],
+        indirect=True,
+    )
     def test_dry_run_mode(
         self,
         dry_run_config_manager: gentlegoose.config_manager.ConfigManager,
         zed_settings_dir: pathlib.Path,
-        mock_global_gitignore: pathlib.Path,
         caplog: pytest.LogCaptureFixture,
     ) -> None:
         """Test that dry run mode doesn't modify files."""
-        # Set the log level to INFO so we can capture the dry run messages
-        caplog.set_level("INFO")
-
         settings_file = zed_settings_dir / "settings.json"
         original_settings = {"file_scan_exclusions": ["**/.git"]}
-        original_content = json.dumps(original_settings, indent=2)
-        settings_file.write_text(original_content, encoding="utf-8")
-
-        global_patterns = ["**/.env", "**/.DS_Store"]
-
-        with (
-            unittest.mock.patch.object(
-                dry_run_config_manager.file_handler,
-                "get_global_gitignore_path",
-                return_value=mock_global_gitignore,
-            ),
-            unittest.mock.patch.object(
-                dry_run_config_manager.file_handler,
-                "read_gitignore_patterns",
-                return_value=global_patterns,
-            ),
-        ):
+        original_content = orjson.dumps(original_settings, option=orjson.OPT_INDENT_2)
+        settings_file.write_bytes(original_content)
+
+        # Capture INFO records from the config manager only during the sync
+        with caplog.at_level("INFO", logger="gentlegoose.config_manager"):
             result = dry_run_config_manager.sync_global_gitignore_to_zed(
                 str(settings_file), update_existing=True
             )
@@ -274,193 +263,97 @@ class TestConfigManager:
         assert result is True
 
         # File should be unchanged
-        updated_content = settings_file.read_text(encoding="utf-8")
+        updated_content = settings_file.read_bytes()
         assert updated_content == original_content
 
         # Should have logged what would be done
-        assert "Would update:" in caplog.text
-        assert "Would add 2 new patterns:" in caplog.text
-
-    def test_preserves_project_specific_exclusions(
+        messages = [record.getMessage() for record in caplog.records]
+        assert any(message.startswith("Would update:") for message in messages)
+        assert "Would add 2 new patterns:" in messages
+
+    @pytest.mark.parametrize(
+        "global_patterns",
+        [["**/.env"]],
+        indirect=True,
+    )
+    def test_sync_writes_through_symlinked_settings_file(
         self,
         config_manager: gentlegoose.config_manager.ConfigManager,
-        zed_settings_dir: pathlib.Path,
-        mock_global_gitignore: pathlib.Path,
+        tmp_path: pathlib.Path,
+        global_patterns: list[str],
     ) -> None:
-        """Test that project-specific exclusions not in global are preserved."""
-        settings_file = zed_settings_dir / "settings.json"
-        existing_settings = {
-            "file_scan_exclusions": [
-                "**/.git",
-                "**/custom-build/",  # Project-specific, not in global
-                "**/temp-cache/",  # Another project-specific pattern
-                "**/.env",  # This one is in global
-            ]
-        }
-        settings_file.write_text(
-            json.dumps(existing_settings, indent=2), encoding="utf-8"
+        """Test that a symlinked settings file updates its target, not the link."""
+        target_file = tmp_path / "dotfiles-settings.json"
+        tests.helpers.write_settings(target_file, {"file_scan_exclusions": ["**/.git"]})
+        settings_file = tmp_path / "settings.json"
+        settings_file.symlink_to(target_file)
+
+        result = config_manager.sync_global_gitignore_to_zed(
+            str(settings_file), update_existing=True
         )
 
-        global_patterns = [
-            "**/.env",
-            "**/.DS_Store",  # This should be added
-            "**/*.log",  # This should be added
-        ]
-
-        with (
-            unittest.mock.patch.object(
-                config_manager.file_handler,
-                "get_global_gitignore_path",
-                return_value=mock_global_gitignore,
-            ),
-            unittest.mock.patch.object(
-                config_manager.file_handler,
-                "read_gitignore_patterns",
-                return_value=global_patterns,
-            ),
-        ):
-            result = config_manager.sync_global_gitignore_to_zed(
-                str(settings_file), update_existing=True
-            )
-
         assert result is True
+        assert settings_file.is_symlink()
 
-        # Read the updated settings
-        updated_content = settings_file.read_text(encoding="utf-8")
-        updated_settings = json.loads(updated_content)
-        exclusions = updated_settings["file_scan_exclusions"]
-
-        # All original project-specific patterns should be preserved
-        assert "**/.git" in exclusions
-        assert "**/custom-build/" in exclusions
-        assert "**/temp-cache/" in exclusions
-        assert "**/.env" in exclusions
-
-        # New global patterns should be added
-        assert "**/.DS_Store" in exclusions
-        assert "**/*.log" in exclusions
-
-        # Verify no duplicates of .env
-        assert exclusions.count("**/.env") == 1
-
-        # Verify project patterns come first (preserve original order)
-        assert exclusions[:4] == [
-            "**/.git",
-            "**/custom-build/",
-            "**/temp-cache/",
-            "**/.env",
-        ]
+        content = tests.helpers.load_settings(target_file)
+        assert content["file_scan_exclusions"] == ["**/.git", *global_patterns]
 
-    def test_preserves_non_exclusion_settings(
+    @pytest.mark.parametrize(
+        "global_patterns",
+        [["**/.env"]],
+        indirect=True,
+    )
+    def test_sync_normalizes_parent_references_in_settings_path(
         self,
         config_manager: gentlegoose.config_manager.ConfigManager,
-        zed_settings_dir: pathlib.Path,
-        mock_global_gitignore: pathlib.Path,
+        tmp_path: pathlib.Path,
+        global_patterns: list[str],
     ) -> None:
-        """Test that non-exclusion settings like soft_wrap are preserved."""
-        # Test constants
-        expected_tab_size = 4
+        """Test that ".." in the settings path does not create stray directories."""
+        settings_file = tmp_path / "typo" / ".." / ".zed" / "settings.json"
 
-        settings_file = zed_settings_dir / "settings.json"
-        existing_settings = {
-            "soft_wrap": "bounded",
-            "theme": "dark",
-            "tab_size": expected_tab_size,
-            "file_scan_exclusions": [
-                "**/.git",
-                "**/node_modules/",
-            ],
-            "formatter": {"language_server": {"name": "prettier"}},
-        }
-        settings_file.write_text(
-            json.dumps(existing_settings, indent=2), encoding="utf-8"
-        )
-
-        global_patterns = [
-            "**/.env",
-            "**/.DS_Store",
-        ]
-
-        with (
-            unittest.mock.patch.object(
-                config_manager.file_handler,
-                "get_global_gitignore_path",
-                return_value=mock_global_gitignore,
-            ),
-            unittest.mock.patch.object(
-                config_manager.file_handler,
-                "read_gitignore_patterns",
-                return_value=global_patterns,
-            ),
-        ):
-            result = config_manager.sync_global_gitignore_to_zed(
-                str(settings_file), update_existing=True
-            )
+        result = config_manager.sync_global_gitignore_to_zed(str(settings_file))
 
         assert result is True
+        assert not (tmp_path / "typo").exists()
 
-        # Read the updated settings
-        updated_content = settings_file.read_text(encoding="utf-8")
-        updated_settings = json.loads(updated_content)
-
-        # All non-exclusion settings should be preserved exactly
-        assert updated_settings["soft_wrap"] == "bounded"
-        assert updated_settings["theme"] == "dark"
-        assert updated_settings["tab_size"] == expected_tab_size
-        assert updated_settings["formatter"] == {
-            "language_server": {"name": "prettier"}
-        }
-
-        # Original exclusions should be preserved
-        exclusions = updated_settings["file_scan_exclusions"]
-        assert "**/.git" in exclusions
-        assert "**/node_modules/" in exclusions
-
-        # New global patterns should be added
-        assert "**/.env" in exclusions
-        assert "**/.DS_Store" in exclusions
-
-        # Verify structure: original exclusions first, then new ones
-        assert exclusions[:2] == ["**/.git", "**/node_modules/"]
-        assert "**/.env" in exclusions[2:]
-        assert "**/.DS_Store" in exclusions[2:]
+        content = tests.helpers.load_settings(tmp_path / ".zed" / "settings.json")
+        assert content["file_scan_exclusions"] == global_patterns
 
-    def test_sync_with_nonexistent_settings_directory(
+    @pytest.mark.parametrize(
+        "global_patterns",
+        [["**/.env"]],
+        indirect=True,
+    )
+    def test_sync_resolves_parent_references_after_symlinked_directory(
         self,
         config_manager: gentlegoose.config_manager.ConfigManager,
-        temp_dir: pathlib.Path,
-        mock_global_gitignore: pathlib.Path,
+        tmp_path: pathlib.Path,
+        global_patterns: list[str],
     ) -> None:
-        """Test syncing when the settings directory doesn't exist."""
-        # Create a settings file path in a nonexistent directory
-        nonexistent_dir = temp_dir / "nonexistent" / "nested"
-        settings_file = nonexistent_dir / "settings.json"
+        """Test that ".." after a symlinked directory follows the link target."""
+        (tmp_path / "real" / "sub").mkdir(parents=True)
+        (tmp_path / "proj").mkdir()
+        (tmp_path / "proj" / "link").symlink_to(pathlib.Path("..") / "real" / "sub")
+        settings_file = tmp_path / "proj" / "link" / ".." / ".zed" / "settings.json"
 
-        expected_global_patterns = [
-            "**/.env",
-            "**/.DS_Store",
-        ]
-
-        with (
-            unittest.mock.patch.object(
-                config_manager.file_handler,
-                "get_global_gitignore_path",
-                return_value=mock_global_gitignore,
-            ),
-            unittest.mock.patch.object(
-                config_manager.file_handler,
-                "read_gitignore_patterns",
-                return_value=expected_global_patterns,
-            ),
-        ):
-            result = config_manager.sync_global_gitignore_to_zed(str(settings_file))
+        result = config_manager.sync_global_gitignore_to_zed(str(settings_file))
 
         assert result is True
+        assert not (tmp_path / "proj" / ".zed").exists()
 
-        # Verify directory and settings file were created
-        assert nonexistent_dir.exists()
-        assert settings_file.exists()
+        content = tests.helpers.load_settings(
+            tmp_path / "real" / ".zed" / "settings.json"
+        )
+        assert content["file_scan_exclusions"] == global_patterns
+
+    def test_get_patterns_to_add_skips_repeated_global_patterns(
+        self, config_manager: gentlegoose.config_manager.ConfigManager
+    ) -> None:
+        """Test that patterns repeated in the global gitignore are added once."""
+        result = config_manager._get_patterns_to_add(
+            ["**/.git", "**/.env"],
+            ["**/.env", "**/*.log", "**/.DS_Store", "**/*.log"],
+        )
 
-        # Verify content
-        content = json.loads(settings_file.read_text(encoding="utf-8"))
-        assert content["file_scan_exclusions"] == expected_global_patterns
+        assert result == ["**/*.log", "**/.DS_Store"]
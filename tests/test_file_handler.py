@@ -1,18 +1,57 @@
-import json
 import pathlib
+import types
+import typing
+import unittest.mock
+
+import pytest
 
 import gentlegoose.file_handler
+import tests.helpers
+
+# Expected results are read-only views since they are shared across tests
+JSON5_COMMENTS_AND_TRAILING_COMMAS = b"""{
+  // This is a comment
+  "soft_wrap": "bounded",
+  "file_scan_exclusions": [
+    "**/.venv/",
+    "**/.terragrunt-cache/", // Another comment
+  ], // Trailing comma here
+}"""
+JSON5_COMMENTS_AND_TRAILING_COMMAS_EXPECTED = types.MappingProxyType({
+    "soft_wrap": "bounded",
+    "file_scan_exclusions": [
+        "**/.venv/",
+        "**/.terragrunt-cache/",
+    ],
+})
+
+# // and trailing-comma sequences inside strings must be kept
+JSON5_STRING_CONTENT = b"""{
+  "url": "https://example.com/path", // comment after a URL
+  "text": "a, ]",
+  "escaped": "quote \\" // still a string",
+}"""
+JSON5_STRING_CONTENT_EXPECTED = types.MappingProxyType({
+    "url": "https://example.com/path",
+    "text": "a, ]",
+    "escaped": 'quote " // still a string',
+})
+
+STRICT_JSON = b'{"file_scan_exclusions": ["**/.env", "**/.DS_Store"]}'
+STRICT_JSON_EXPECTED = types.MappingProxyType({
+    "file_scan_exclusions": ["**/.env", "**/.DS_Store"]
+})
 
 
 class TestFileHandler:
     """Test FileHandler functionality."""
 
     def test_read_gitignore_patterns(
-        self, file_handler: gentlegoose.file_handler.FileHandler, temp_dir: pathlib.Path
+        self, file_handler: gentlegoose.file_handler.FileHandler, tmp_path: pathlib.Path
     ) -> None:
         """Test reading and parsing gitignore patterns."""
-        gitignore_file = temp_dir / "test_gitignore"
-        gitignore_content = """# Comments should be ignored
+        gitignore_file = tmp_path / "test_gitignore"
+        gitignore_content = b"""# Comments should be ignored
 .env
 .fmt/
 
@@ -22,7 +61,7 @@ scratch/
 *.log
 __pycache__/
 """
-        gitignore_file.write_text(gitignore_content, encoding="utf-8")
+        gitignore_file.write_bytes(gitignore_content)
 
         patterns = file_handler.read_gitignore_patterns(gitignore_file)
 
@@ -38,15 +77,15 @@ __pycache__/
         assert patterns == expected_patterns
 
     def test_read_gitignore_patterns_with_existing_glob_patterns(
-        self, file_handler: gentlegoose.file_handler.FileHandler, temp_dir: pathlib.Path
+        self, file_handler: gentlegoose.file_handler.FileHandler, tmp_path: pathlib.Path
     ) -> None:
         """Test that existing ** patterns are not double-prefixed."""
-        gitignore_file = temp_dir / "test_gitignore"
-        gitignore_content = """**/.env
+        gitignore_file = tmp_path / "test_gitignore"
+        gitignore_content = b"""**/.env
 **/node_modules/
 .DS_Store
 """
-        gitignore_file.write_text(gitignore_content, encoding="utf-8")
+        gitignore_file.write_bytes(gitignore_content)
 
         patterns = file_handler.read_gitignore_patterns(gitignore_file)
 
@@ -59,43 +98,181 @@ __pycache__/
         assert patterns == expected_patterns
 
     def test_read_nonexistent_gitignore(
-        self, file_handler: gentlegoose.file_handler.FileHandler, temp_dir: pathlib.Path
+        self, file_handler: gentlegoose.file_handler.FileHandler, tmp_path: pathlib.Path
     ) -> None:
         """Test reading nonexistent gitignore file returns empty list."""
-        nonexistent_file = temp_dir / "nonexistent"
+        nonexistent_file = tmp_path / "nonexistent"
         patterns = file_handler.read_gitignore_patterns(nonexistent_file)
         assert patterns == []
 
-    def test_parse_json5_with_comments_and_trailing_commas(
-        self, file_handler: gentlegoose.file_handler.FileHandler
-    ) -> None:
-        """Test JSON5 parsing with comments and trailing commas."""
-        json5_content = """{
-  // This is a comment
-  "soft_wrap": "bounded",
-  "file_scan_exclusions": [
-    "**/.venv/",
-    "**/.terragrunt-cache/", // Another comment
-  ], // Trailing comma here
-}"""
+    def test_global_gitignore_path_is_cached(self, tmp_path: pathlib.Path) -> None:
+        """Test that git config is only read on the first lookup."""
+        file_handler = gentlegoose.file_handler.FileHandler()
+        excludes_file = tmp_path / "ignore"
+
+        with unittest.mock.patch.object(
+            file_handler, "_read_global_gitignore_path", return_value=excludes_file
+        ) as read_path:
+            assert file_handler.get_global_gitignore_path() == excludes_file
+            assert file_handler.get_global_gitignore_path() == excludes_file
 
-        result = file_handler._parse_json5(json5_content)
+        read_path.assert_called_once_with()
+
+    @pytest.mark.parametrize(
+        ("gitconfig_content", "expected"),
+        [
+            pytest.param(
+                b"""[user]
+\texcludesfile = /not/core
+[core]
+\t# excludesfile = /commented/out
+\tExcludesFile = "/path/to/ignore"
+""",
+                pathlib.Path("/path/to/ignore"),
+                id="core_section_only",
+            ),
+            pytest.param(
+                b"""[core]
+\texcludesfile = ~/.gi # global ignores
+""",
+                pathlib.Path("~/.gi").expanduser(),
+                id="inline_comment",
+            ),
+            pytest.param(
+                b"""[core]
+\texcludesfile = /first
+[user]
+\tname = Example
+[core]
+\texcludesfile = /second
+""",
+                pathlib.Path("/second"),
+                id="last_value_wins",
+            ),
+            pytest.param(
+                b"""[core]
+\texcludesfile = "/a\\\\b"
+""",
+                pathlib.Path("/a\\b"),
+                id="quoted_escapes",
+            ),
+            pytest.param(
+                b"""[core]
+\teditor = vim \\
+\texcludesfile = /continued
+""",
+                None,
+                id="line_continuation",
+            ),
+        ],
+    )
+    def test_reads_excludesfile_from_core_section(
+        self,
+        file_handler: gentlegoose.file_handler.FileHandler,
+        tmp_path: pathlib.Path,
+        gitconfig_content: bytes,
+        expected: pathlib.Path | None,
+    ) -> None:
+        """Test git config lookup matches git's core.excludesfile value."""
+        gitconfig = tmp_path / ".gitconfig"
+        gitconfig.write_bytes(gitconfig_content)
 
-        expected = {
-            "soft_wrap": "bounded",
-            "file_scan_exclusions": [
-                "**/.venv/",
-                "**/.terragrunt-cache/",
-            ],
-        }
+        with unittest.mock.patch.object(
+            gentlegoose.file_handler, "GLOBAL_GITCONFIG_PATH", gitconfig
+        ):
+            result = file_handler._read_global_gitignore_path()
 
         assert result == expected
 
+    def test_skips_dulwich_when_scan_finds_no_excludesfile(
+        self, file_handler: gentlegoose.file_handler.FileHandler, tmp_path: pathlib.Path
+    ) -> None:
+        """Test a config without core.excludesfile is not re-read with dulwich."""
+        gitconfig = tmp_path / ".gitconfig"
+        gitconfig.write_bytes(
+            b"""[user]
+\tname = Example
+[alias]
+\tst = status
+"""
+        )
+
+        with (
+            unittest.mock.patch.object(
+                gentlegoose.file_handler, "GLOBAL_GITCONFIG_PATH", gitconfig
+            ),
+            unittest.mock.patch.object(
+                file_handler, "_read_global_gitignore_path_with_dulwich"
+            ) as read_with_dulwich,
+        ):
+            result = file_handler._read_global_gitignore_path()
+
+        read_with_dulwich.assert_not_called()
+        assert result is None
+
+    def test_reads_excludesfile_with_dulwich_when_config_has_includes(
+        self, file_handler: gentlegoose.file_handler.FileHandler, tmp_path: pathlib.Path
+    ) -> None:
+        """Test configs with include directives use the included value."""
+        (tmp_path / "gitconfig.local").write_bytes(
+            b"""[core]
+\texcludesfile = /from/include
+"""
+        )
+        gitconfig = tmp_path / ".gitconfig"
+        gitconfig.write_bytes(
+            b"""[core]
+\texcludesfile = /overridden
+[include]
+\tpath = gitconfig.local
+"""
+        )
+
+        with (
+            unittest.mock.patch.object(
+                gentlegoose.file_handler, "GLOBAL_GITCONFIG_PATH", gitconfig
+            ),
+            unittest.mock.patch.object(
+                file_handler, "_scan_core_excludesfile"
+            ) as scan_config,
+        ):
+            result = file_handler._read_global_gitignore_path()
+
+        scan_config.assert_not_called()
+        assert result == pathlib.Path("/from/include")
+
+    @pytest.mark.parametrize(
+        ("json5_content", "expected"),
+        [
+            pytest.param(
+                JSON5_COMMENTS_AND_TRAILING_COMMAS,
+                JSON5_COMMENTS_AND_TRAILING_COMMAS_EXPECTED,
+                id="comments_and_trailing_commas",
+            ),
+            pytest.param(
+                JSON5_STRING_CONTENT,
+                JSON5_STRING_CONTENT_EXPECTED,
+                id="comment_and_comma_like_string_content",
+            ),
+            pytest.param(STRICT_JSON, STRICT_JSON_EXPECTED, id="strict_json"),
+        ],
+    )
+    def test_parse_json5(
+        self,
+        file_handler: gentlegoose.file_handler.FileHandler,
+        json5_content: bytes,
+        expected: types.MappingProxyType[str, typing.Any],
+    ) -> None:
+        """Test JSON5 parsing of comments, trailing commas and string content."""
+        assert file_handler._parse_json5(json5_content.decode()) == expected
+
     def test_atomic_write_zed_settings(
-        self, file_handler: gentlegoose.file_handler.FileHandler, temp_dir: pathlib.Path
+        self,
+        file_handler: gentlegoose.file_handler.FileHandler,
+        tmp_path: pathlib.Path,
     ) -> None:
         """Test atomic writing of settings file."""
-        settings_file = temp_dir / "settings.json"
+        settings_file = tmp_path / "settings.json"
         settings_data = {"file_scan_exclusions": ["**/.env", "**/.DS_Store"]}
 
         result = file_handler.write_zed_settings(settings_file, settings_data)
@@ -104,17 +281,17 @@ __pycache__/
         assert settings_file.exists()
 
         # Verify content can be read back
-        content = json.loads(settings_file.read_text(encoding="utf-8"))
+        content = tests.helpers.load_settings(settings_file)
         assert content == settings_data
 
     def test_write_settings_validates_json(
-        self, file_handler: gentlegoose.file_handler.FileHandler, temp_dir: pathlib.Path
+        self, file_handler: gentlegoose.file_handler.FileHandler, tmp_path: pathlib.Path
     ) -> None:
         """Test that write operation validates JSON before committing."""
-        settings_file = temp_dir / "settings.json"
+        settings_file = tmp_path / "settings.json"
 
         # Create an object that can't be JSON serialized
-        invalid_settings = {"key": {1, 2, 3}}  # sets aren't JSON serializable
+        invalid_settings = {"key": object()}
 
         result = file_handler.write_zed_settings(settings_file, invalid_settings)
 
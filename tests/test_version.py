@@ -0,0 +1,32 @@
+import pytest
+
+import gentlegoose
+import gentlegoose.cli
+
+
+class TestVersion:
+    """Test lazy version lookup and the --version option."""
+
+    def test_version_resolved_through_module_getattr(self) -> None:
+        """Test that __version__ is looked up on access, not stored on import."""
+        assert "__version__" not in vars(gentlegoose)
+        assert gentlegoose.__version__ == gentlegoose._version()
+
+    def test_unknown_module_attribute_raises(self) -> None:
+        """Test that names other than __version__ still raise AttributeError."""
+        with pytest.raises(AttributeError, match="no attribute 'missing'"):
+            _ = gentlegoose.missing
+
+    def test_version_option_prints_version_and_exits(
+        self, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test that --version prints the program name and version, then exits."""
+        parser = gentlegoose.cli.create_parser()
+
+        with pytest.raises(SystemExit) as exc_info:
+            parser.parse_args(["--version"])
+
+        assert exc_info.value.code == 0
+        captured = capsys.readouterr()
+        assert captured.out == f"{parser.prog} {gentlegoose.__version__}\n"
+        assert not captured.err